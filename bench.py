@@ -1,10 +1,13 @@
+import os
 import uuid
 import modal
+from concurrent.futures import ThreadPoolExecutor
 
 
 app = modal.App("topk-bench")
 
-image = modal.Image.debian_slim().pip_install("topk-bench==0.1.1")
+# Keep in sync with the version in Cargo.toml: the benches use its API (e.g. `warmup`)
+image = modal.Image.debian_slim().pip_install("topk-bench==0.2.0")
 
 cache = modal.Volume.from_name("topk-bench-cache", create_if_missing=True)
 cache_dir = "/tmp/topk-bench"
@@ -41,6 +44,7 @@ def qps(
     provider: str = None,
     timeout: int = 30,
     warmup: bool = True,
+    batch_size: int = 1,
 ):
     sizes = list_sizes(only=size)
     providers = list_providers(only=provider)
@@ -54,6 +58,8 @@ def qps(
             size=size,
             timeout=timeout,
             warmup=warmup,
+            batch_size=batch_size,
+            query_cache=query_cache_enabled(),
         )
         for size in sizes
         for region, provider, _ in providers
@@ -79,6 +85,7 @@ def filters(
             size=size,
             timeout=timeout,
             warmup=warmup,
+            query_cache=query_cache_enabled(),
         )
         for size in sizes
         for region, provider, _ in providers
@@ -104,6 +111,7 @@ def rw(
             size=size,
             timeout=timeout,
             warmup=warmup,
+            query_cache=query_cache_enabled(),
         )
         for size in sizes
         for region, provider, _ in providers
@@ -167,10 +175,13 @@ def run_qps_bench(
     timeout: int,
     benchmark_id: str,
     warmup: bool = True,
+    batch_size: int = 1,
+    query_cache: bool = False,
 ):
     import topk_bench as tb
 
-    provider_client = create_provider(provider_name)
+    provider_client = create_provider(provider_name, query_cache=query_cache)
+    provider_client.warmup(f"{collection_prefix}-{size}")
 
     if warmup:
         print(f"BENCH] Warming up {provider_name} ({size})...")
@@ -196,6 +207,10 @@ def run_qps_bench(
         )
 
     print(f"BENCH] Benchmarking {provider_name} ({size})...")
+    # Flush each step's metrics in the background while the next step runs. Each file holds
+    # whatever was recorded up to its flush, so concatenating them gives the complete run.
+    metrics_writer = ThreadPoolExecutor(max_workers=1)
+    writes = []
     for concurrency in [1, 2, 4, 8]:
         tb.query(
             provider=provider_client,
@@ -205,6 +220,7 @@ def run_qps_bench(
                 cache_dir=cache_dir,
                 #
                 concurrency=concurrency,
+                batch_size=batch_size,
                 #
                 queries=f"s3://topk-bench/queries-{size}.parquet",
                 timeout=timeout,
@@ -218,9 +234,16 @@ def run_qps_bench(
             ),
         )
 
-    tb.write_metrics(
-        f"s3://{out_bucket}/{benchmark_id}/{provider_name}_qps_{size}.parquet"
-    )
+        writes.append(
+            metrics_writer.submit(
+                tb.write_metrics,
+                f"s3://{out_bucket}/{benchmark_id}/{provider_name}_qps_{size}_c{concurrency}.parquet",
+            )
+        )
+
+    metrics_writer.shutdown(wait=True)
+    for write in writes:
+        write.result()
 
 
 def run_filter_bench(
@@ -229,10 +252,11 @@ def run_filter_bench(
     timeout: int,
     benchmark_id: str,
     warmup: bool,
+    query_cache: bool = False,
 ):
     import topk_bench as tb
 
-    provider = create_provider(provider_name)
+    provider = create_provider(provider_name, query_cache=query_cache)
 
     if warmup:
         print(f"BENCH] Warming up {provider_name} ({size})...")
@@ -301,10 +325,11 @@ def run_rw_bench(
     timeout: int,
     benchmark_id: str,
     warmup: bool = True,
+    query_cache: bool = False,
 ):
     import topk_bench as tb
 
-    provider = create_provider(provider_name)
+    provider = create_provider(provider_name, query_cache=query_cache)
 
     if warmup:
         print(f"BENCH] Warming up {provider_name} ({size})...")
@@ -392,22 +417,34 @@ def list_providers(only: str = None):
     return providers
 
 
-def create_provider(name: str):
+def query_cache_enabled() -> bool:
+    # Read by the local entrypoints and passed to the runners, since Modal containers
+    # don't see the local environment
+    return os.environ.get("TOPK_BENCH_QUERY_CACHE", "0") == "1"
+
+
+def create_provider(name: str, query_cache: bool = False):
     import topk_bench as tb
 
     if name == "milvus":
-        return tb.MilvusProvider()
+        provider = tb.MilvusProvider()
     elif name == "topk":
-        return tb.TopKProvider()
+        provider = tb.TopKProvider()
     elif name == "turbopuffer":
-        return tb.TurbopufferProvider()
+        provider = tb.TurbopufferProvider()
     elif name == "qdrant":
-        return tb.QdrantProvider()
+        provider = tb.QdrantProvider()
     elif name == "pinecone":
-        return tb.PineconeProvider()
+        provider = tb.PineconeProvider()
     else:
         raise ValueError(f"Invalid provider: {name}")
 
+    # Opt-in semantic query cache; results are reported under `<provider>-cached`.
+    if query_cache:
+        provider = tb.CachingProvider(provider)
+
+    return provider
+
 
 def cleanup_provider(provider_name: str, wet: bool = False):
     provider = create_provider(provider_name)
@@ -425,15 +462,21 @@ def cleanup_provider(provider_name: str, wet: bool = False):
 
 def run(tasks):
     errors = []
-    tasks = list(tasks)
-
-    print(f"Running {len(tasks)} tasks...")
-    for t in tasks:
-        try:
-            t.get()  # awaits the task
-        except Exception as e:
-            print(f"Task failed: {e}")
-            errors.append(e)
+    pending = list(tasks)
+
+    print(f"Running {len(pending)} tasks...")
+    # Poll the tasks in turn from this thread, so failures are reported as soon as they
+    # happen and Ctrl-C stops waiting right away
+    while pending:
+        for t in list(pending):
+            try:
+                t.get(timeout=1)
+            except TimeoutError:  # still running
+                continue
+            except Exception as e:
+                print(f"Task failed: {e}")
+                errors.append(e)
+            pending.remove(t)
 
     if errors:
         print(f"{len(errors)} tasks failed.")
@@ -7,3 +7,4 @@ from .providers.turbopuffer import *
 from .providers.milvus import *
 from .providers.qdrant import *
 from .providers.pinecone import *
+from .providers.cache import *
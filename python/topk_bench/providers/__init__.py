@@ -0,0 +1,8 @@
+import os
+from functools import lru_cache
+
+
+@lru_cache
+def _env(name: str, default: str | None = None) -> str:
+    """Read a provider environment variable once per process."""
+    return os.environ[name] if default is None else os.environ.get(name, default)
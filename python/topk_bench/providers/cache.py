@@ -0,0 +1,197 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+from ..topk_bench import Document, Provider
+
+
+class CachingProvider(Provider):
+    """
+    Semantic query cache in front of another provider.
+
+    A query is answered from the cache when a previous query with the same `top_k` and
+    filters had a vector with cosine similarity >= `threshold`. Each `(collection, top_k,
+    int_filter, keyword_filter)` combination keeps at most `capacity` entries, evicted
+    in FIFO order. Writes to a collection invalidate all of its cached results.
+
+    `query_by_id` results are kept in an LRU of `id_capacity` documents. Only found
+    documents are cached (so freshness polling still reaches the provider until the
+    document shows up), and upserting or deleting an id drops its entry.
+    """
+
+    def __init__(
+        self,
+        provider: Provider,
+        capacity: int = 1024,
+        threshold: float = 0.97,
+        id_capacity: int = 65536,
+    ):
+        self.provider = provider
+        self.capacity = capacity
+        self.threshold = threshold
+        self.id_capacity = id_capacity
+        self._lock = threading.Lock()
+        self._caches: dict[tuple, QueryCache] = {}
+        # (collection, id) -> found documents, in LRU order
+        self._documents: OrderedDict[tuple, tuple[Document, ...]] = OrderedDict()
+        # Bumped before and after every write, so results fetched before or during a write
+        # are not cached
+        self._generation = 0
+
+    def name(self) -> str:
+        return f"{self.provider.name()}-cached"
+
+    def setup(self, collection: str):
+        self.provider.setup(collection)
+
+    def warmup(self, collection: str):
+        self.provider.warmup(collection)
+
+    def query_by_id(self, collection: str, id: str):
+        key = (collection, id)
+
+        with self._lock:
+            docs = self._documents.get(key)
+            if docs is not None:
+                self._documents.move_to_end(key)
+                return list(docs)
+            generation = self._generation
+
+        results = self.provider.query_by_id(collection, id)
+
+        with self._lock:
+            if results and generation == self._generation:
+                self._documents[key] = tuple(results)
+                if len(self._documents) > self.id_capacity:
+                    self._documents.popitem(last=False)
+
+        return results
+
+    def query(
+        self,
+        collection: str,
+        vector: list[float],
+        top_k: int,
+        int_filter: int | None,
+        keyword_filter: str | None,
+    ) -> list[Document]:
+        key = (collection, top_k, int_filter, keyword_filter)
+        unit = normalize(vector)
+
+        with self._lock:
+            cache = self._caches.get(key)
+            if cache is not None:
+                results = cache.get(unit, self.threshold)
+                if results is not None:
+                    return results
+            generation = self._generation
+
+        results = self.provider.query(
+            collection, vector, top_k, int_filter, keyword_filter
+        )
+
+        with self._lock:
+            if generation != self._generation:
+                return results
+            if key not in self._caches:
+                self._caches[key] = QueryCache(self.capacity, len(unit))
+            self._caches[key].put(unit, results)
+
+        return results
+
+    def upsert(self, collection: str, docs: list[Document]):
+        ids = [doc.id for doc in docs]
+        self.invalidate(collection, ids)
+        # Invalidate again once the write returns: lookups that overlapped it saw the first
+        # bump's generation, and may have read pre-write results.
+        try:
+            self.provider.upsert(collection, docs)
+        finally:
+            self.invalidate(collection, ids)
+
+    def delete_by_id(self, collection: str, ids: list[str]):
+        self.invalidate(collection, ids)
+        try:
+            self.provider.delete_by_id(collection, ids)
+        finally:
+            self.invalidate(collection, ids)
+
+    def delete_collection(self, collection: str):
+        self.invalidate(collection)
+        try:
+            self.provider.delete_collection(collection)
+        finally:
+            self.invalidate(collection)
+
+    def list_collections(self):
+        return self.provider.list_collections()
+
+    def close(self):
+        self.provider.close()
+
+    def invalidate(self, collection: str, ids: list[str] | None = None):
+        """Drop cached results for `collection`, and its documents for `ids` (or all)."""
+        with self._lock:
+            self._generation += 1
+
+            for key in [key for key in self._caches if key[0] == collection]:
+                del self._caches[key]
+
+            if ids is None:
+                ids = [id for c, id in self._documents if c == collection]
+            for id in ids:
+                self._documents.pop((collection, id), None)
+
+
+class QueryCache:
+    """Fixed-size FIFO of unit query vectors and their results."""
+
+    def __init__(self, capacity: int, dimension: int):
+        self.vectors = np.zeros((capacity, dimension), dtype=np.float32)
+        self.results: list[list[Document]] = [[] for _ in range(capacity)]
+        # fp16 fingerprint -> slot, for exact repeats (skips the similarity scan)
+        self.fingerprints: dict[bytes, int] = {}
+        self.slot_fingerprints: list[bytes | None] = [None] * capacity
+        self.size = 0
+        self.next = 0
+
+    def get(self, vector: np.ndarray, threshold: float) -> list[Document] | None:
+        slot = self.fingerprints.get(fingerprint(vector))
+        if slot is not None:
+            return self.results[slot]
+
+        if self.size == 0:
+            return None
+
+        similarities = self.vectors[: self.size] @ vector
+        slot = int(np.argmax(similarities))
+        if similarities[slot] >= threshold:
+            return self.results[slot]
+
+        return None
+
+    def put(self, vector: np.ndarray, results: list[Document]):
+        slot = self.next
+
+        # Evict the oldest entry
+        evicted = self.slot_fingerprints[slot]
+        if evicted is not None and self.fingerprints.get(evicted) == slot:
+            del self.fingerprints[evicted]
+
+        key = fingerprint(vector)
+        self.vectors[slot] = vector
+        self.results[slot] = results
+        self.fingerprints[key] = slot
+        self.slot_fingerprints[slot] = key
+
+        self.next = (slot + 1) % len(self.results)
+        self.size = min(self.size + 1, len(self.results))
+
+
+def normalize(vector: list[float]) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    return v / norm if norm > 0 else v
+
+
+def fingerprint(vector: np.ndarray) -> bytes:
+    return vector.astype(np.float16).tobytes()
@@ -1,14 +1,41 @@
-import os
 from pymilvus import DataType, MilvusClient
 from ..topk_bench import Document, Provider
+from . import _env
+
+# One client per (uri, token), reused by every provider instance in the process
+_CLIENTS: dict[tuple[str, str], MilvusClient] = {}
 
 
 class MilvusProvider(Provider):
     def __init__(self, uri: str | None = None, token: str | None = None):
-        self.client = MilvusClient(
-            uri=uri or os.environ["MILVUS_URI"],
-            token=token or os.environ["MILVUS_TOKEN"],
-        )
+        uri = uri or _env("MILVUS_URI")
+        token = token or _env("MILVUS_TOKEN")
+        if (uri, token) not in _CLIENTS:
+            _CLIENTS[(uri, token)] = MilvusClient(uri=uri, token=token)
+        self.client = _CLIENTS[(uri, token)]
+        self._sanitized: dict[str, str] = {}
+        self._filter_cache: dict[tuple[int | None, str | None], str | None] = {}
+
+    def _collection_name(self, collection: str) -> str:
+        """Get cached sanitized collection name."""
+        if collection not in self._sanitized:
+            self._sanitized[collection] = sanitize_collection(collection)
+        return self._sanitized[collection]
+
+    def prepare_filter(
+        self, int_filter: int | None, keyword_filter: str | None
+    ) -> str | None:
+        """Get cached filter expression for the given filter values."""
+        key = (int_filter, keyword_filter)
+        if key not in self._filter_cache:
+            filters = []
+            if int_filter is not None:
+                filters.append(f"int_filter <= {int_filter}")
+            if keyword_filter is not None:
+                filters.append(f"TEXT_MATCH(keyword_filter, '{keyword_filter}')")
+
+            self._filter_cache[key] = " and ".join(filters) if filters else None
+        return self._filter_cache[key]
 
     def name(self) -> str:
         return "milvus"
@@ -63,18 +90,21 @@ class MilvusProvider(Provider):
         )
 
         self.client.create_collection(
-            collection_name=sanitize_collection(collection),
+            collection_name=self._collection_name(collection),
             schema=schema,
             index_params=index_params,
         )
 
         self.client.load_collection(
-            collection_name=sanitize_collection(collection),
+            collection_name=self._collection_name(collection),
         )
 
+    def warmup(self, collection: str):
+        self.client.get_load_state(collection_name=self._collection_name(collection))
+
     def query_by_id(self, collection: str, id: str):
         result = self.client.query(
-            collection_name=sanitize_collection(collection),
+            collection_name=self._collection_name(collection),
             ids=[id],
             output_fields=["text", "int_filter", "keyword_filter"],
         )
@@ -88,52 +118,59 @@ class MilvusProvider(Provider):
         int_filter: int | None,
         keyword_filter: str | None,
     ) -> list[Document]:
-        # Build filter
-        filters = []
-        if int_filter is not None:
-            filters.append(f"int_filter <= {int_filter}")
-        if keyword_filter is not None:
-            filters.append(f"TEXT_MATCH(keyword_filter, '{keyword_filter}')")
-
-        # Search
+        return self.query_batch(
+            collection, [vector], top_k, int_filter, keyword_filter
+        )[0]
+
+    def query_batch(
+        self,
+        collection: str,
+        vectors: list[list[float]],
+        top_k: int,
+        int_filter: int | None,
+        keyword_filter: str | None,
+    ) -> list[list[Document]]:
+        # Search (one result list per query vector)
         results = self.client.search(
-            collection_name=sanitize_collection(collection),
-            data=[vector],
+            collection_name=self._collection_name(collection),
+            data=vectors,
             anns_field="dense_embedding",
             limit=top_k,
-            filter=" and ".join(filters) if filters else None,
+            filter=self.prepare_filter(int_filter, keyword_filter),
             output_fields=["text", "int_filter", "keyword_filter"],
         )
 
         # Convert
-        return [to_document_from_search(hit) for hits in results for hit in hits]
+        return [[to_document_from_search(hit) for hit in hits] for hits in results]
 
     def upsert(self, collection: str, docs: list[Document]):
-        self.client.upsert(
-            collection_name=sanitize_collection(collection),
-            data=[
+        rows = []
+        for doc in docs:
+            # `doc.dense_embedding` builds a new Python list per access, so read it once
+            dense_embedding = doc.dense_embedding
+            rows.append(
                 {
                     "id": doc.id,
                     "text": doc.text,
-                    "dense_embedding": doc.dense_embedding
-                    if doc.dense_embedding is not None
+                    "dense_embedding": dense_embedding
+                    if dense_embedding is not None
                     else [],
                     "int_filter": doc.int_filter,
                     "keyword_filter": doc.keyword_filter,
                 }
-                for doc in docs
-            ],
-        )
+            )
+
+        self.client.upsert(collection_name=self._collection_name(collection), data=rows)
 
     def delete_by_id(self, collection: str, ids: list[str]):
         self.client.delete(
-            collection_name=sanitize_collection(collection),
+            collection_name=self._collection_name(collection),
             filter=f"id in {ids}",
         )
 
     def delete_collection(self, collection: str):
         self.client.drop_collection(
-            collection_name=sanitize_collection(collection),
+            collection_name=self._collection_name(collection),
         )
 
     def list_collections(self):
@@ -149,20 +186,9 @@ def sanitize_collection(collection: str) -> str:
 
 def to_document_from_query(entity: dict) -> Document:
     """Convert Milvus query result entity to Document."""
-    return Document(
-        id=str(entity.get("id", "")),
-        text=entity.get("text", ""),
-        int_filter=entity.get("int_filter", 0),
-        keyword_filter=entity.get("keyword_filter", ""),
-    )
+    return Document.from_dict(entity)
 
 
 def to_document_from_search(hit: dict) -> Document:
     """Convert Milvus search result hit to Document."""
-    entity = hit.get("entity", {})
-    return Document(
-        id=str(hit.get("id", "")),
-        text=entity.get("text", ""),
-        int_filter=entity.get("int_filter", 0),
-        keyword_filter=entity.get("keyword_filter", ""),
-    )
+    return Document.from_dict(hit.get("entity", {}), id=hit.get("id", ""))
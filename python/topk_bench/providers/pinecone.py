@@ -1,7 +1,19 @@
-import os
 from pinecone import QueryResponse, ServerlessSpec
 from pinecone.grpc import GRPCIndex, PineconeGRPC
 from ..topk_bench import Document, Provider
+from . import _env
+
+# One client per API key and one index handle per collection, so their gRPC channels are
+# reused instead of reconnecting
+_CLIENTS: dict[str, PineconeGRPC] = {}
+_INDEX_CACHE: dict[tuple[str, str], GRPCIndex] = {}
+
+# Deadline (seconds) for requests sent as gRPC futures. Without one, `future.result()`
+# gives up after the SDK's 5s default while the request is still in flight.
+_REQUEST_TIMEOUT = 120
+
+# Vectors per upsert request; larger batches are sent as parallel requests
+_UPSERT_CHUNK_SIZE = 100
 
 
 class PineconeProvider(Provider):
@@ -11,19 +23,32 @@ class PineconeProvider(Provider):
         cloud: str | None = None,
         region: str | None = None,
     ):
-        api_key = api_key or os.environ["PINECONE_API_KEY"]
-        cloud = cloud or os.environ.get("PINECONE_CLOUD", "aws")
-        region = region or os.environ.get("PINECONE_REGION", "us-east-1")
-        self.client = PineconeGRPC(api_key=api_key)
+        api_key = api_key or _env("PINECONE_API_KEY")
+        cloud = cloud or _env("PINECONE_CLOUD", "aws")
+        region = region or _env("PINECONE_REGION", "us-east-1")
+        if api_key not in _CLIENTS:
+            _CLIENTS[api_key] = PineconeGRPC(api_key=api_key)
+        self.client = _CLIENTS[api_key]
+        self.api_key = api_key
         self.cloud = cloud
         self.region = region
-        self._index_cache: dict[str, GRPCIndex] = {}
+        self._filter_cache: dict[tuple, dict | None] = {}
+
+    def prepare_filter(
+        self, int_filter: int | None, keyword_filter: str | None
+    ) -> dict | None:
+        """Get cached filter for the given filter values."""
+        key = (int_filter, keyword_filter)
+        if key not in self._filter_cache:
+            self._filter_cache[key] = build_filter(int_filter, keyword_filter)
+        return self._filter_cache[key]
 
     def _get_index(self, collection: str):
         """Get or create cached index instance."""
-        if collection not in self._index_cache:
-            self._index_cache[collection] = self.client.Index(collection)
-        return self._index_cache[collection]
+        key = (self.api_key, collection)
+        if key not in _INDEX_CACHE:
+            _INDEX_CACHE[key] = self.client.Index(collection)
+        return _INDEX_CACHE[key]
 
     def name(self) -> str:
         return "pinecone"
@@ -42,6 +67,9 @@ class PineconeProvider(Provider):
             ),
         )
 
+    def warmup(self, collection: str):
+        self._get_index(collection).describe_index_stats()
+
     def query_by_id(self, collection: str, id: str):
         index = self._get_index(collection)
 
@@ -59,41 +87,75 @@ class PineconeProvider(Provider):
     ) -> list[Document]:
         index = self._get_index(collection)
 
-        # Build filter
-        filt = {}
-        if int_filter is not None:
-            filt["int_filter"] = {"$lte": int_filter}
-        if keyword_filter is not None:
-            filt["keyword_filter"] = {"$in": [keyword_filter]}
-
         results: QueryResponse = index.query(
             vector=vector,
             top_k=top_k,
-            filter=None if not filt else filt,
+            filter=self.prepare_filter(int_filter, keyword_filter),
             include_metadata=True,
         )
 
         return [to_document(match) for match in results["matches"]]
 
+    def query_batch(
+        self,
+        collection: str,
+        vectors: list[list[float]],
+        top_k: int,
+        int_filter: int | None,
+        keyword_filter: str | None,
+    ) -> list[list[Document]]:
+        index = self._get_index(collection)
+        filt = self.prepare_filter(int_filter, keyword_filter)
+
+        # No multi-vector query in Pinecone, so send all requests as gRPC futures
+        futures = [
+            index.query(
+                vector=vector,
+                top_k=top_k,
+                filter=filt,
+                include_metadata=True,
+                async_req=True,
+                timeout=_REQUEST_TIMEOUT,
+            )
+            for vector in vectors
+        ]
+
+        return [
+            [
+                to_document(match)
+                for match in future.result(timeout=_REQUEST_TIMEOUT)["matches"]
+            ]
+            for future in futures
+        ]
+
     def upsert(self, collection: str, docs: list[Document]):
         index = self._get_index(collection)
 
-        index.upsert(
-            vectors=[
-                (
-                    doc.id,
-                    doc.dense_embedding,
-                    {
-                        "text": doc.text,
-                        "int_filter": doc.int_filter,
-                        "keyword_filter": doc.keyword_filter.split(" ")
-                        if isinstance(doc.keyword_filter, str)
-                        else doc.keyword_filter,
-                    },
-                )
-                for doc in docs
-            ]
-        )
+        vectors = [
+            (
+                doc.id,
+                doc.dense_embedding,
+                {
+                    "text": doc.text,
+                    "int_filter": doc.int_filter,
+                    "keyword_filter": doc.keyword_filter_tokens,
+                },
+            )
+            for doc in docs
+        ]
+
+        # Send chunks as gRPC futures, so their round trips overlap with encoding the next
+        # chunk, and wait for all of them before reporting the batch as upserted.
+        futures = [
+            index.upsert(
+                vectors=vectors[i : i + _UPSERT_CHUNK_SIZE],
+                async_req=True,
+                timeout=_REQUEST_TIMEOUT,
+            )
+            for i in range(0, len(vectors), _UPSERT_CHUNK_SIZE)
+        ]
+        for future in futures:
+            future.result(timeout=_REQUEST_TIMEOUT)
 
     def delete_by_id(self, collection: str, ids: list[str]):
         index = self._get_index(collection)
@@ -101,6 +163,7 @@ class PineconeProvider(Provider):
 
     def delete_collection(self, collection: str):
         self.client.delete_index(collection)
+        _INDEX_CACHE.pop((self.api_key, collection), None)
 
     def list_collections(self):
         return [index.name for index in self.client.list_indexes()]
@@ -109,10 +172,15 @@ class PineconeProvider(Provider):
         pass
 
 
+def build_filter(int_filter: int | None, keyword_filter: str | None) -> dict | None:
+    filt = {}
+    if int_filter is not None:
+        filt["int_filter"] = {"$lte": int_filter}
+    if keyword_filter is not None:
+        filt["keyword_filter"] = {"$in": [keyword_filter]}
+
+    return None if not filt else filt
+
+
 def to_document(result: dict) -> Document:
-    return Document(
-        id=result["id"],
-        text=result["metadata"]["text"],
-        int_filter=int(result["metadata"]["int_filter"]),
-        keyword_filter=" ".join(result["metadata"]["keyword_filter"]),
-    )
+    return Document.from_dict(result["metadata"], id=result["id"])
@@ -1,14 +1,36 @@
-import os
 from qdrant_client import QdrantClient, models
 from ..topk_bench import Document, Provider
+from . import _env
+
+# One gRPC client per (url, api_key), reused by every provider instance in the process
+_CLIENTS: dict[tuple[str, str], QdrantClient] = {}
 
 
 class QdrantProvider(Provider):
     def __init__(self, url: str | None = None, api_key: str | None = None):
-        self.client = QdrantClient(
-            url=url or os.environ["QDRANT_URL"],
-            api_key=api_key or os.environ["QDRANT_API_KEY"],
-        )
+        url = url or _env("QDRANT_URL")
+        api_key = api_key or _env("QDRANT_API_KEY")
+        if (url, api_key) not in _CLIENTS:
+            # Use gRPC (protobuf over a multiplexed HTTP/2 channel) instead of REST/JSON
+            _CLIENTS[(url, api_key)] = QdrantClient(
+                url=url,
+                api_key=api_key,
+                prefer_grpc=True,
+                grpc_port=int(_env("QDRANT_GRPC_PORT", "6334")),
+                grpc_options={"grpc.keepalive_time_ms": 10000},
+                timeout=60,
+            )
+        self.client = _CLIENTS[(url, api_key)]
+        self._filter_cache: dict[tuple, models.Filter | None] = {}
+
+    def prepare_filter(
+        self, int_filter: int | None, keyword_filter: str | None
+    ) -> models.Filter | None:
+        """Get cached filter for the given filter values."""
+        key = (int_filter, keyword_filter)
+        if key not in self._filter_cache:
+            self._filter_cache[key] = build_filter(int_filter, keyword_filter)
+        return self._filter_cache[key]
 
     def name(self) -> str:
         return "qdrant"
@@ -37,6 +59,9 @@ class QdrantProvider(Provider):
                 field_schema=models.PayloadSchemaType.KEYWORD,
             )
 
+    def warmup(self, collection: str):
+        self.client.collection_exists(collection_name=collection)
+
     def query_by_id(self, collection: str, id: str):
         result = self.client.retrieve(
             collection_name=collection,
@@ -53,35 +78,39 @@ class QdrantProvider(Provider):
         int_filter: int | None,
         keyword_filter: str | None,
     ) -> list[Document]:
-        # Build filter
-        filters = []
-        if int_filter is not None:
-            filters.append(
-                models.FieldCondition(
-                    key="int_filter",
-                    range=models.Range(lte=int_filter),
-                )
-            )
-        if keyword_filter is not None:
-            filters.append(
-                models.FieldCondition(
-                    key="keyword_filter",
-                    match=models.MatchValue(value=keyword_filter),
-                )
-            )
-        qfilter = None
-        if filters:
-            qfilter = models.Filter(must=filters)
-
         result = self.client.query_points(
             collection_name=collection,
             query=vector,
             limit=top_k,
             with_payload=True,
-            query_filter=qfilter,
+            query_filter=self.prepare_filter(int_filter, keyword_filter),
         )
         return [to_document(point) for point in result.points]
 
+    def query_batch(
+        self,
+        collection: str,
+        vectors: list[list[float]],
+        top_k: int,
+        int_filter: int | None,
+        keyword_filter: str | None,
+    ) -> list[list[Document]]:
+        qfilter = self.prepare_filter(int_filter, keyword_filter)
+
+        results = self.client.query_batch_points(
+            collection_name=collection,
+            requests=[
+                models.QueryRequest(
+                    query=vector,
+                    limit=top_k,
+                    with_payload=True,
+                    filter=qfilter,
+                )
+                for vector in vectors
+            ],
+        )
+        return [[to_document(point) for point in result.points] for result in results]
+
     def upsert(self, collection: str, docs: list[Document]):
         try:
             self.client.upsert(
@@ -95,9 +124,7 @@ class QdrantProvider(Provider):
                         payload={
                             "text": doc.text,
                             "int_filter": doc.int_filter,
-                            "keyword_filter": doc.keyword_filter.split(" ")
-                            if isinstance(doc.keyword_filter, str)
-                            else doc.keyword_filter,
+                            "keyword_filter": doc.keyword_filter_tokens,
                         },
                     )
                     for doc in docs
@@ -125,23 +152,32 @@ class QdrantProvider(Provider):
         pass
 
 
+def build_filter(
+    int_filter: int | None, keyword_filter: str | None
+) -> models.Filter | None:
+    filters = []
+    if int_filter is not None:
+        filters.append(
+            models.FieldCondition(
+                key="int_filter",
+                range=models.Range(lte=int_filter),
+            )
+        )
+    if keyword_filter is not None:
+        filters.append(
+            models.FieldCondition(
+                key="keyword_filter",
+                match=models.MatchValue(value=keyword_filter),
+            )
+        )
+
+    if not filters:
+        return None
+
+    return models.Filter(must=filters)
+
+
 def to_document(point) -> Document:
     """Convert Qdrant point to Document."""
-    payload = point.payload or {}
-    # Handle keyword_filter - Qdrant stores it as a list, but we need it as a string
-    keyword_filter = payload.get("keyword_filter")
-    if isinstance(keyword_filter, list):
-        # Join list items with space to convert back to string
-        keyword_filter = " ".join(str(k) for k in keyword_filter)
-    elif keyword_filter is None:
-        keyword_filter = ""
-    else:
-        # Already a string, keep as-is
-        keyword_filter = str(keyword_filter)
-
-    return Document(
-        id=str(point.id),
-        text=payload.get("text", ""),
-        int_filter=payload.get("int_filter", 0),
-        keyword_filter=keyword_filter,
-    )
+    # Qdrant stores keyword_filter as a list, which `from_dict` joins back into a string
+    return Document.from_dict(point.payload or {}, id=point.id)
@@ -5,6 +5,9 @@ import topk_sdk.error as te
 import topk_sdk.schema as ts
 from ..topk_bench import Document, Provider
 
+# Expressions are immutable, so they can be built once and shared by every query
+_VECTOR_DISTANCE = tq.field("vector_distance")
+
 
 class TopKProvider(Provider):
     def __init__(
@@ -20,6 +23,29 @@ class TopKProvider(Provider):
             host=host or os.environ.get("TOPK_HOST", "topk.io"),
             https=https or bool(os.environ.get("TOPK_HTTPS", "1") == "1"),
         )
+        self._collections: dict[str, t.CollectionClient] = {}
+        self._filter_cache: dict[tuple, list] = {}
+
+    def _collection(self, collection: str) -> t.CollectionClient:
+        """Get cached collection client."""
+        if collection not in self._collections:
+            self._collections[collection] = self.client.collection(collection)
+        return self._collections[collection]
+
+    def prepare_filter(
+        self, int_filter: int | None, keyword_filter: str | None
+    ) -> list:
+        """Get cached filter expressions for the given filter values."""
+        key = (int_filter, keyword_filter)
+        if key not in self._filter_cache:
+            filters = []
+            if int_filter is not None:
+                filters.append(tq.field("int_filter").lte(int_filter))
+            if keyword_filter is not None:
+                filters.append(tq.field("keyword_filter").match_all(keyword_filter))
+
+            self._filter_cache[key] = filters
+        return self._filter_cache[key]
 
     def name(self) -> str:
         return "topk"
@@ -41,7 +67,7 @@ class TopKProvider(Provider):
             pass
 
     def query_by_id(self, collection: str, id: str):
-        results = self.client.collection(collection).query(
+        results = self._collection(collection).query(
             tq.select("text", "int_filter", "keyword_filter")
             .filter(tq.field("_id").eq(id))
             .limit(1)
@@ -64,26 +90,24 @@ class TopKProvider(Provider):
             vector_distance=tq.fn.vector_distance("dense_embedding", vector),
         )
 
-        if int_filter is not None:
-            query = query.filter(tq.field("int_filter").lte(int_filter))
-
-        if keyword_filter is not None:
-            query = query.filter(tq.field("keyword_filter").match_all(keyword_filter))
+        for expr in self.prepare_filter(int_filter, keyword_filter):
+            query = query.filter(expr)
 
-        query = query.topk(tq.field("vector_distance"), top_k)
+        query = query.topk(_VECTOR_DISTANCE, top_k)
 
-        results = self.client.collection(collection).query(query)
+        results = self._collection(collection).query(query)
 
         return [to_document(row) for row in results]
 
     def upsert(self, collection: str, docs: list[Document]):
-        self.client.collection(collection).upsert([from_document(doc) for doc in docs])
+        self._collection(collection).upsert([from_document(doc) for doc in docs])
 
     def delete_by_id(self, collection: str, ids: list[str]):
-        self.client.collection(collection).delete(ids)
+        self._collection(collection).delete(ids)
 
     def delete_collection(self, collection: str):
         self.client.collections().delete(collection)
+        self._collections.pop(collection, None)
 
     def list_collections(self):
         return [collection.name for collection in self.client.collections().list()]
@@ -93,12 +117,7 @@ class TopKProvider(Provider):
 
 
 def to_document(row: dict) -> Document:
-    return Document(
-        id=row["_id"],
-        text=row["text"],
-        int_filter=row["int_filter"],
-        keyword_filter=row["keyword_filter"],
-    )
+    return Document.from_dict(row)
 
 
 def from_document(doc: Document) -> dict:
@@ -1,11 +1,20 @@
 from abc import ABC, abstractmethod
 
+# Immutable: attributes are read-only
 class Document:
     id: str
     text: str
     dense_embedding: list[float]
+    # `dense_embedding` as little-endian float32 bytes (e.g. for `np.frombuffer(b, "<f4")`)
+    dense_embedding_bytes: bytes | None
     int_filter: int
     keyword_filter: str
+    keyword_filter_tokens: list[str]
+
+    @staticmethod
+    def from_dict(row: dict, id: str | int | None = None) -> Document:
+        """Build a document from a provider result row (`text`, `int_filter`, `keyword_filter`)."""
+        pass
 
 class Provider(ABC):
     @abstractmethod
@@ -27,6 +36,21 @@ class Provider(ABC):
     ):
         pass
 
+    def warmup(self, collection: str):
+        """Warm up the connection to `collection`. No-op by default."""
+        pass
+
+    def query_batch(
+        self,
+        collection: str,
+        vectors: list[list[float]],
+        top_k: int,
+        int_filter: int | None,
+        keyword_filter: str | None,
+    ) -> list[list[Document]]:
+        """Query multiple vectors at once. Defaults to one `query` call per vector."""
+        pass
+
     @abstractmethod
     def upsert(self, collection: str, docs: list[dict]):
         pass
@@ -2,28 +2,38 @@ use arrow::datatypes::Int32Type;
 use arrow_array::{
     types::Float64Type, Array, LargeListArray, LargeStringArray, PrimitiveArray, RecordBatch,
 };
-use pyo3::prelude::*;
+use pyo3::{
+    prelude::*,
+    types::{PyBytes, PyDict},
+};
 
-#[pyclass]
+// Frozen: documents are never mutated from Python, and frozen classes skip the runtime
+// borrow checking on every field access and on extraction back into Rust.
+#[pyclass(frozen)]
 #[derive(Debug, Clone)]
 pub struct Document {
-    #[pyo3(get, set)]
+    #[pyo3(get)]
     pub id: String,
 
-    #[pyo3(get, set)]
+    #[pyo3(get)]
     pub text: String,
 
-    #[pyo3(get, set)]
+    #[pyo3(get)]
     pub int_filter: u32,
 
-    #[pyo3(get, set)]
+    #[pyo3(get)]
     pub keyword_filter: String,
 
+    // `keyword_filter` split on spaces, for providers that store keywords as a list.
+    // Precomputed for dataset documents (the upsert path), so providers don't re-split it
+    // for every upsert. Query results never need it, so they leave it unset.
+    pub keyword_filter_tokens: Option<Vec<String>>,
+
     // Only set when upserting. We don't fetch raw vectors during queries.
-    #[pyo3(get, set)]
+    #[pyo3(get)]
     pub dense_embedding: Option<Vec<f32>>,
 
-    #[pyo3(get, set)]
+    #[pyo3(get)]
     pub tag: Option<String>,
 }
 
@@ -59,10 +69,88 @@ impl Document {
             text,
             int_filter,
             keyword_filter,
+            keyword_filter_tokens: None,
             dense_embedding,
             tag,
         }
     }
+
+    /// Build a document from a provider result row (e.g. a Milvus entity or a Qdrant payload).
+    ///
+    /// Reads `text`, `int_filter` and `keyword_filter` from `row`, defaulting missing fields.
+    /// `keyword_filter` may be a string or a list of tokens. The id is taken from `id` if
+    /// given, otherwise from the row's `id` or `_id` key.
+    #[staticmethod]
+    #[pyo3(signature = (row, id=None))]
+    fn from_dict(row: &Bound<'_, PyAny>, id: Option<&Bound<'_, PyAny>>) -> PyResult<Self> {
+        let id = match id {
+            Some(id) => Some(id.clone()),
+            None => match get_field(row, "id")? {
+                Some(id) => Some(id),
+                None => get_field(row, "_id")?,
+            },
+        };
+        let id = match id {
+            Some(id) => id.str()?.to_string(),
+            None => String::new(),
+        };
+
+        let text = match get_field(row, "text")? {
+            Some(text) => text.extract()?,
+            None => String::new(),
+        };
+
+        let int_filter = match get_field(row, "int_filter")? {
+            // Some providers (e.g. Pinecone) return all numbers as floats
+            Some(v) => match v.extract::<u32>() {
+                Ok(v) => v,
+                Err(_) => v.extract::<f64>()? as u32,
+            },
+            None => 0,
+        };
+
+        let keyword_filter = match get_field(row, "keyword_filter")? {
+            Some(v) => match v.extract::<String>() {
+                Ok(v) => v,
+                Err(_) => v.extract::<Vec<String>>()?.join(" "),
+            },
+            None => String::new(),
+        };
+
+        Ok(Self::new(id, text, int_filter, keyword_filter, None, None))
+    }
+
+    /// `keyword_filter` split on spaces (precomputed if available, else split on demand).
+    #[getter]
+    fn keyword_filter_tokens(&self) -> Vec<String> {
+        match &self.keyword_filter_tokens {
+            Some(tokens) => tokens.clone(),
+            None => tokenize(&self.keyword_filter),
+        }
+    }
+
+    /// `dense_embedding` as little-endian f32 bytes, without building a Python list of floats.
+    #[getter]
+    fn dense_embedding_bytes<'py>(&self, py: Python<'py>) -> Option<Bound<'py, PyBytes>> {
+        self.dense_embedding.as_ref().map(|embedding| {
+            let bytes: Vec<u8> = embedding.iter().flat_map(|v| v.to_le_bytes()).collect();
+            PyBytes::new(py, &bytes)
+        })
+    }
+}
+
+/// Get a non-null field from a dict, or any mapping with a `get` method.
+fn get_field<'py>(row: &Bound<'py, PyAny>, key: &str) -> PyResult<Option<Bound<'py, PyAny>>> {
+    let value = match row.downcast::<PyDict>() {
+        Ok(dict) => dict.get_item(key)?,
+        Err(_) => Some(row.call_method1("get", (key,))?),
+    };
+
+    Ok(value.filter(|v| !v.is_none()))
+}
+
+fn tokenize(keyword_filter: &str) -> Vec<String> {
+    keyword_filter.split(' ').map(str::to_string).collect()
 }
 
 pub fn parse_from_batch(batch: RecordBatch) -> Vec<Document> {
@@ -132,6 +220,7 @@ pub fn parse_from_batch(batch: RecordBatch) -> Vec<Document> {
             text,
             dense_embedding: Some(dense_embedding),
             int_filter,
+            keyword_filter_tokens: Some(tokenize(&keyword_filter)),
             keyword_filter,
             tag: None,
         });
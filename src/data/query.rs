@@ -1,7 +1,9 @@
 use std::collections::HashMap;
+use std::sync::{Arc, Mutex};
 
 use arrow::json::LineDelimitedWriter;
 use arrow_array::RecordBatch;
+use once_cell::sync::Lazy;
 use parquet::arrow::arrow_reader::ParquetRecordBatchReaderBuilder;
 
 use crate::s3::open_file;
@@ -14,7 +16,27 @@ pub struct Query {
         HashMap</*int_filter*/ u32, HashMap</*keyword_filter*/ String, /*doc IDs*/ Vec<i64>>>,
 }
 
-pub async fn load_from_path(path: &str, cache_dir: &str) -> anyhow::Result<Vec<Query>> {
+/// Parsed query sets by path. Benchmarks run many `query` configs over the same query
+/// file, so it is only parsed once per process.
+static QUERIES: Lazy<Mutex<HashMap<String, Arc<Vec<Query>>>>> =
+    Lazy::new(|| Mutex::new(HashMap::new()));
+
+pub async fn load_from_path(path: &str, cache_dir: &str) -> anyhow::Result<Arc<Vec<Query>>> {
+    let cached = QUERIES.lock().unwrap().get(path).cloned();
+    if let Some(queries) = cached {
+        return Ok(queries);
+    }
+
+    let queries = Arc::new(parse_from_path(path, cache_dir).await?);
+    QUERIES
+        .lock()
+        .unwrap()
+        .insert(path.to_string(), queries.clone());
+
+    Ok(queries)
+}
+
+async fn parse_from_path(path: &str, cache_dir: &str) -> anyhow::Result<Vec<Query>> {
     let file = open_file(path, cache_dir).await?;
 
     // Load queries in a blocking task to avoid blocking the async runtime
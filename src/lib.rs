@@ -2,7 +2,7 @@ use colored::control;
 use once_cell::sync::Lazy;
 use pyo3::{exceptions::PyValueError, prelude::*};
 use std::sync::Mutex;
-use tokio::runtime::Runtime;
+use tokio::runtime::{Handle, Runtime};
 
 mod ingest;
 mod query;
@@ -67,6 +67,15 @@ fn shutdown_runtime(py: Python<'_>) {
     });
 }
 
+/// Handle to the shared runtime, so that callers don't hold the lock while blocking on it.
+/// This lets `write_metrics` run on one thread while `query` runs on another.
+fn runtime_handle() -> anyhow::Result<Handle> {
+    match *RUNTIME.lock().unwrap() {
+        Some(ref runtime) => Ok(runtime.handle().clone()),
+        None => Err(anyhow::anyhow!("Runtime was shut down")),
+    }
+}
+
 #[pyfunction(name = "ingest")]
 #[pyo3(signature = (provider, config))]
 pub(crate) fn ingest_fn(
@@ -75,12 +84,7 @@ pub(crate) fn ingest_fn(
     config: ingest::IngestConfig,
 ) -> PyResult<()> {
     py.allow_threads(|| {
-        let runtime_guard = RUNTIME.lock().unwrap();
-        if let Some(ref runtime) = *runtime_guard {
-            runtime.block_on(async move { ingest::start(provider, config).await })
-        } else {
-            Err(anyhow::anyhow!("Runtime was shut down"))
-        }
+        runtime_handle()?.block_on(async move { ingest::start(provider, config).await })
     })
     .map_err(|e| PyValueError::new_err(format!("Failed to ingest: {e}")))?;
 
@@ -95,12 +99,7 @@ pub(crate) fn query_fn(
     config: query::QueryConfig,
 ) -> PyResult<()> {
     py.allow_threads(|| {
-        let runtime_guard = RUNTIME.lock().unwrap();
-        if let Some(ref runtime) = *runtime_guard {
-            runtime.block_on(async move { query::start(config, provider).await })
-        } else {
-            Err(anyhow::anyhow!("Runtime was shut down"))
-        }
+        runtime_handle()?.block_on(async move { query::start(config, provider).await })
     })
     .map_err(|e| PyValueError::new_err(format!("Failed to query: {e:?}")))?;
 
@@ -110,15 +109,8 @@ pub(crate) fn query_fn(
 #[pyfunction]
 #[pyo3(signature = (path,))]
 pub(crate) fn write_metrics(py: Python<'_>, path: &str) -> PyResult<()> {
-    py.allow_threads(|| {
-        let runtime_guard = RUNTIME.lock().unwrap();
-        if let Some(ref runtime) = *runtime_guard {
-            runtime.block_on(telemetry::export(&path))
-        } else {
-            Err(anyhow::anyhow!("Runtime was shut down"))
-        }
-    })
-    .map_err(|e| PyValueError::new_err(format!("Failed to write metrics: {e:?}")))?;
+    py.allow_threads(|| runtime_handle()?.block_on(telemetry::export(&path)))
+        .map_err(|e| PyValueError::new_err(format!("Failed to write metrics: {e:?}")))?;
 
     Ok(())
 }
@@ -20,6 +20,41 @@ impl Provider {
         let _ = (args, kwargs); // Suppress unused variable warnings
         Ok(Self {})
     }
+
+    /// Warm up the connection to `collection` before a benchmark. No-op by default.
+    #[pyo3(signature = (collection))]
+    fn warmup(&self, collection: String) {
+        let _ = collection; // Suppress unused variable warnings
+    }
+
+    /// Default batch query: issues one `query` call per vector.
+    /// Providers whose backend accepts multiple query vectors per request override this.
+    #[pyo3(signature = (collection, vectors, top_k, int_filter, keyword_filter))]
+    fn query_batch(
+        slf: &Bound<'_, Self>,
+        collection: String,
+        vectors: Vec<Vec<f32>>,
+        top_k: u32,
+        int_filter: Option<u32>,
+        keyword_filter: Option<String>,
+    ) -> PyResult<Vec<PyObject>> {
+        vectors
+            .into_iter()
+            .map(|vector| {
+                let result = slf.call_method1(
+                    "query",
+                    (
+                        collection.clone(),
+                        vector,
+                        top_k,
+                        int_filter,
+                        keyword_filter.clone(),
+                    ),
+                )?;
+                Ok(result.unbind())
+            })
+            .collect()
+    }
 }
 
 #[derive(Debug, Clone)]
@@ -109,6 +144,30 @@ impl PyProvider {
         Ok(documents)
     }
 
+    pub async fn query_batch(
+        &self,
+        collection: String,
+        vectors: Vec<Vec<f32>>,
+        top_k: u32,
+        int_filter: Option<u32>,
+        keyword_filter: Option<String>,
+    ) -> PyResult<Vec<Vec<Document>>> {
+        let provider = self.py.clone();
+
+        let documents = run_py(move |py| {
+            let result = provider.call_method1(
+                py,
+                "query_batch",
+                (collection, vectors, top_k, int_filter, keyword_filter),
+            )?;
+            let result = result.downcast_bound::<PyList>(py)?;
+            Vec::<Vec<Document>>::extract_bound(result)
+        })
+        .await?;
+
+        Ok(documents)
+    }
+
     pub async fn close(&self) -> PyResult<()> {
         let provider = self.py.clone();
 
@@ -9,6 +9,7 @@ pub struct QueryConfig {
     pub int_filter: Option<u32>,
     pub keyword_filter: Option<String>,
     pub concurrency: usize,
+    pub batch_size: usize,
     pub size: String,
     pub timeout: u64,
     pub warmup: bool,
@@ -20,7 +21,7 @@ pub struct QueryConfig {
 #[pymethods]
 impl QueryConfig {
     #[new]
-    #[pyo3(signature = (collection, queries, top_k, concurrency, size, timeout, mode, cache_dir, int_filter=None, keyword_filter=None, read_write=false, warmup=false))]
+    #[pyo3(signature = (collection, queries, top_k, concurrency, size, timeout, mode, cache_dir, int_filter=None, keyword_filter=None, read_write=false, warmup=false, batch_size=1))]
     fn new(
         collection: String,
         queries: String,
@@ -34,11 +35,16 @@ impl QueryConfig {
         keyword_filter: Option<String>,
         read_write: bool,
         warmup: bool,
+        batch_size: usize,
     ) -> PyResult<Self> {
         if !["100k", "1m", "10m"].contains(&size.as_str()) {
             return Err(PyValueError::new_err(format!("Invalid size: {}", size)));
         }
 
+        if batch_size == 0 {
+            return Err(PyValueError::new_err("batch_size must be at least 1"));
+        }
+
         Ok(Self {
             collection,
             queries,
@@ -46,6 +52,7 @@ impl QueryConfig {
             int_filter,
             keyword_filter,
             concurrency,
+            batch_size,
             size,
             timeout,
             mode,
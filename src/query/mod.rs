@@ -1,4 +1,5 @@
 use std::collections::HashMap;
+use std::sync::Arc;
 use std::time::{Duration, Instant};
 
 use async_channel::{Receiver, Sender};
@@ -40,6 +41,7 @@ pub async fn start(config: QueryConfig, provider: PyProvider) -> anyhow::Result<
             ("queries", config.queries.clone()),
             ("top_k", config.top_k.to_string()),
             ("concurrency", config.concurrency.to_string()),
+            ("batch_size", config.batch_size.to_string()),
             ("size", config.size.clone()),
             ("timeout", config.timeout.to_string()),
             (
@@ -211,8 +213,8 @@ async fn measure_recall(
 
     // Send queries to the workers
     let generator = tokio::spawn(async move {
-        for query in queries {
-            queries_tx.send(query).await?;
+        for query in queries.iter() {
+            queries_tx.send(query.clone()).await?;
         }
         anyhow::Ok(())
     });
@@ -240,7 +242,7 @@ async fn measure_recall(
 }
 
 // Spawn query generator task
-async fn random_query_generator(queries: Vec<Query>, tx: Sender<Query>) -> anyhow::Result<()> {
+async fn random_query_generator(queries: Arc<Vec<Query>>, tx: Sender<Query>) -> anyhow::Result<()> {
     loop {
         let random_query = queries
             .choose(&mut rand::rng())
@@ -279,34 +281,64 @@ async fn spawn_workers(
                     ss.elapsed().as_millis() as f64,
                 );
 
+                // Fill the rest of the batch with whatever queries are already available
+                let mut batch = vec![query];
+                while batch.len() < config.batch_size {
+                    match queries.try_recv() {
+                        Ok(query) => batch.push(query),
+                        Err(_) => break,
+                    }
+                }
+
                 loop {
                     let start = Instant::now();
 
-                    match provider
-                        .query(
-                            config.collection.clone(),
-                            query.dense.clone(),
-                            config.top_k,
-                            config.int_filter.clone(),
-                            config.keyword_filter.clone(),
-                        )
-                        .await
-                    {
-                        Ok(res) => {
+                    let result = if let [query] = &batch[..] {
+                        provider
+                            .query(
+                                config.collection.clone(),
+                                query.dense.clone(),
+                                config.top_k,
+                                config.int_filter.clone(),
+                                config.keyword_filter.clone(),
+                            )
+                            .await
+                            .map(|res| vec![res])
+                    } else {
+                        provider
+                            .query_batch(
+                                config.collection.clone(),
+                                batch.iter().map(|query| query.dense.clone()).collect(),
+                                config.top_k,
+                                config.int_filter.clone(),
+                                config.keyword_filter.clone(),
+                            )
+                            .await
+                    };
+
+                    match result {
+                        Ok(results) => {
                             if recall {
-                                let recall = calculate_recall(res, query.clone(), &config)
-                                    .expect("failed to calculate recall");
-                                m.record("bench.query.recall", recall as f64);
+                                for (res, query) in results.into_iter().zip(batch.iter()) {
+                                    let recall = calculate_recall(res, query.clone(), &config)
+                                        .expect("failed to calculate recall");
+                                    m.record("bench.query.recall", recall as f64);
+                                }
                             } else {
                                 let duration = start.elapsed().as_millis();
-                                m.record("bench.query.oks", 1.0);
+                                for _ in 0..batch.len() {
+                                    m.record("bench.query.oks", 1.0);
+                                }
                                 m.record("bench.query.latency_ms", duration as f64);
                             }
 
                             break;
                         }
                         Err(error) => {
-                            m.record("bench.query.errors", 1.0);
+                            // Count each query in the failed batch, like `oks`
+                            for _ in 0..batch.len() {
+                                m.record("bench.query.errors", 1.0);
+                            }
                             error!(?error, "Failed to query documents");
 
                             // Sleep & retry
@@ -1,4 +1,6 @@
 use std::env;
+use std::os::unix::fs::FileExt;
+use std::sync::Arc;
 use std::{
     fs::File,
     path::{Path, PathBuf},
@@ -9,8 +11,16 @@ use aws_config::Region;
 use aws_sdk_s3::primitives::ByteStream;
 use aws_sdk_s3::{config::Credentials, Client, Config};
 use tokio::fs::File as TokioFile;
+use tokio::sync::Semaphore;
+use tokio::task::JoinSet;
 use tracing::{debug, info};
 
+/// Size of each ranged GET when downloading a dataset.
+const PART_SIZE: u64 = 16 * 1024 * 1024;
+
+/// Maximum number of ranged GETs in flight per download.
+const MAX_CONCURRENT_PARTS: usize = 32;
+
 pub(crate) fn new_client() -> anyhow::Result<Client> {
     let creds = Credentials::new(
         env::var("AWS_ACCESS_KEY_ID")?,
@@ -105,15 +115,67 @@ async fn pull_file(url: String, out_dir: impl Into<String>) -> anyhow::Result<Pa
     let s3 = new_client()?;
 
     let start = Instant::now();
-    let resp = s3.get_object().bucket(bucket).key(key).send().await?;
-    let mut data = resp.body.into_async_read();
     // Ensure the directory exists
     std::fs::create_dir_all(Path::new(&out).parent().unwrap())?;
-    let mut file = tokio::fs::File::create(&out).await?;
-    tokio::io::copy(&mut data, &mut file).await?;
+    download_parts(&s3, bucket, key, &out).await?;
     let duration = start.elapsed();
 
     info!(?out, ?duration, "Dataset downloaded");
 
     Ok(PathBuf::from(out))
 }
+
+/// Download an object with concurrent ranged GETs, writing each part at its offset.
+///
+/// Parts are written to a temporary file which is renamed once complete, so an
+/// interrupted download is never mistaken for a cached dataset.
+async fn download_parts(s3: &Client, bucket: &str, key: &str, out: &str) -> anyhow::Result<()> {
+    let head = s3.head_object().bucket(bucket).key(key).send().await?;
+    let size = match head.content_length() {
+        Some(size) if size >= 0 => size as u64,
+        // Defaulting to 0 would cache an empty file as a valid dataset
+        _ => anyhow::bail!("Missing content length for s3://{bucket}/{key}"),
+    };
+
+    let tmp = format!("{out}.part");
+    let file = std::fs::File::create(&tmp)?;
+    file.set_len(size)?;
+    let file = Arc::new(file);
+
+    let semaphore = Arc::new(Semaphore::new(MAX_CONCURRENT_PARTS));
+    let mut parts = JoinSet::new();
+
+    for offset in (0..size).step_by(PART_SIZE as usize) {
+        let end = (offset + PART_SIZE).min(size) - 1;
+        let s3 = s3.clone();
+        let bucket = bucket.to_string();
+        let key = key.to_string();
+        let file = file.clone();
+        let semaphore = semaphore.clone();
+
+        parts.spawn(async move {
+            let _permit = semaphore.acquire_owned().await?;
+
+            let resp = s3
+                .get_object()
+                .bucket(bucket)
+                .key(key)
+                .range(format!("bytes={offset}-{end}"))
+                .send()
+                .await?;
+            let bytes = resp.body.collect().await?.into_bytes();
+
+            tokio::task::spawn_blocking(move || file.write_all_at(&bytes, offset)).await??;
+
+            anyhow::Ok(())
+        });
+    }
+
+    while let Some(res) = parts.join_next().await {
+        res??;
+    }
+
+    std::fs::rename(&tmp, out)?;
+
+    Ok(())
+}
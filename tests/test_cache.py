@@ -0,0 +1,136 @@
+import unittest
+import numpy as np
+from topk_bench import CachingProvider, Document
+from topk_bench.providers.cache import QueryCache, normalize
+
+
+class FakeProvider:
+    """Counts calls, and optionally runs `during_write` while a write is in flight."""
+
+    def __init__(self):
+        self.queries = 0
+        self.lookups = 0
+        self.version = "old"
+        self.during_write = None
+
+    def name(self) -> str:
+        return "fake"
+
+    def query_by_id(self, collection: str, id: str):
+        self.lookups += 1
+        return [doc(id, self.version)]
+
+    def query(self, collection, vector, top_k, int_filter, keyword_filter):
+        self.queries += 1
+        return [doc("1", self.version)]
+
+    def upsert(self, collection: str, docs: list[Document]):
+        if self.during_write is not None:
+            self.during_write()
+        self.version = "new"
+
+    def delete_by_id(self, collection: str, ids: list[str]):
+        if self.during_write is not None:
+            self.during_write()
+
+
+def doc(id: str, text: str) -> Document:
+    return Document(id=id, text=text, int_filter=0, keyword_filter="")
+
+
+class QueryCacheTest(unittest.TestCase):
+    def test_exact_and_similar_hits(self):
+        cache = QueryCache(capacity=4, dimension=2)
+        results = [doc("1", "a")]
+        cache.put(normalize([1.0, 0.0]), results)
+
+        self.assertIs(cache.get(normalize([1.0, 0.0]), 0.97), results)
+        self.assertIs(cache.get(normalize([1.0, 0.01]), 0.97), results)
+        self.assertIsNone(cache.get(normalize([0.0, 1.0]), 0.97))
+
+    def test_fifo_eviction(self):
+        cache = QueryCache(capacity=2, dimension=2)
+        first = normalize([1.0, 0.0])
+        cache.put(first, [doc("1", "a")])
+        cache.put(normalize([0.0, 1.0]), [doc("2", "b")])
+        cache.put(normalize([-1.0, 0.0]), [doc("3", "c")])
+
+        self.assertIsNone(cache.get(first, 0.97))
+        self.assertEqual(cache.get(normalize([0.0, 1.0]), 0.97)[0].id, "2")
+        self.assertEqual(cache.get(normalize([-1.0, 0.0]), 0.97)[0].id, "3")
+        self.assertEqual(cache.size, 2)
+
+    def test_normalize_zero_vector(self):
+        np.testing.assert_array_equal(normalize([0.0, 0.0]), [0.0, 0.0])
+
+
+class CachingProviderTest(unittest.TestCase):
+    def setUp(self):
+        self.inner = FakeProvider()
+        self.provider = CachingProvider(self.inner, capacity=4, id_capacity=2)
+
+    def query(self, vector=(1.0, 0.0), int_filter=None):
+        return self.provider.query("c", list(vector), 10, int_filter, None)
+
+    def test_name(self):
+        self.assertEqual(self.provider.name(), "fake-cached")
+
+    def test_query_hit(self):
+        self.query()
+        self.query((1.0, 0.01))
+        self.assertEqual(self.inner.queries, 1)
+
+        # Different filters are cached separately
+        self.query(int_filter=10)
+        self.assertEqual(self.inner.queries, 2)
+
+    def test_query_by_id_lru(self):
+        self.provider.query_by_id("c", "1")
+        self.provider.query_by_id("c", "2")
+        self.provider.query_by_id("c", "1")
+        self.provider.query_by_id("c", "3")  # evicts "2"
+        self.assertEqual(self.inner.lookups, 3)
+
+        self.provider.query_by_id("c", "1")
+        self.assertEqual(self.inner.lookups, 3)
+        self.provider.query_by_id("c", "2")
+        self.assertEqual(self.inner.lookups, 4)
+
+    def test_query_by_id_misses_not_cached(self):
+        self.inner.query_by_id = lambda collection, id: []
+        self.assertEqual(self.provider.query_by_id("c", "1"), [])
+        self.assertNotIn(("c", "1"), self.provider._documents)
+
+    def test_write_invalidates(self):
+        self.query()
+        self.provider.query_by_id("c", "1")
+        self.provider.upsert("c", [doc("1", "x")])
+
+        self.assertEqual(self.query()[0].text, "new")
+        self.assertEqual(self.provider.query_by_id("c", "1")[0].text, "new")
+        self.assertEqual(self.inner.queries, 2)
+        self.assertEqual(self.inner.lookups, 2)
+
+    def test_lookups_during_write_not_cached(self):
+        def during_write():
+            self.assertEqual(self.query()[0].text, "old")
+            self.assertEqual(self.provider.query_by_id("c", "1")[0].text, "old")
+
+        self.inner.during_write = during_write
+        self.provider.upsert("c", [doc("1", "x")])
+
+        self.assertEqual(self.query()[0].text, "new")
+        self.assertEqual(self.provider.query_by_id("c", "1")[0].text, "new")
+
+    def test_delete_by_id_invalidates_ids(self):
+        self.provider.query_by_id("c", "1")
+        self.provider.query_by_id("c", "2")
+        self.provider.delete_by_id("c", ["1"])
+
+        self.provider.query_by_id("c", "1")
+        self.provider.query_by_id("c", "2")
+        self.assertEqual(self.inner.lookups, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()